@@ -1,18 +1,39 @@
 import os
 import re
-import base64
-import uuid
+import json
+import asyncio
+import time
+import atexit
+import hashlib
+import secrets
 import string
+import sqlite3
+import subprocess
 import logging
 import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Literal
 from urllib.parse import unquote, urljoin
 
+import orjson
 import requests
-from fastapi import FastAPI
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from fastapi import FastAPI, File, HTTPException, Request, Response, UploadFile
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+from worker import _ffmpeg_bin, process_audio_worker
+
+# SIMD base64 decoder when available; the stdlib one has the same signature and output
+try:
+    from pybase64 import b64decode as _b64decode
+except ImportError:
+    from base64 import b64decode as _b64decode
 
 # -------------------- Logging --------------------
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
@@ -21,7 +42,72 @@ logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(me
 STATIC_DIR = "static_output"
 os.makedirs(STATIC_DIR, exist_ok=True)
 
-app = FastAPI()
+# Uploads above this are refused with 413, whether or not the client sends Content-Length
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(50 * 1024 * 1024)))
+
+@asynccontextmanager
+async def lifespan(app):
+    # Startup hooks are defined further down, next to the state they touch
+    await asyncio.to_thread(cleanup_stale_uploads)
+    warm_signasl_cache()
+    yield
+
+app = FastAPI(lifespan=lifespan)
+
+def _json_response(content, status_code=200, headers=None):
+    # orjson-encoded body for the hot routes; FastAPI's ORJSONResponse is deprecated
+    return Response(orjson.dumps(content), status_code=status_code, headers=headers,
+                    media_type="application/json")
+
+def _upload_too_large():
+    return JSONResponse(status_code=413, content={"status": "error", "error": "Upload too large"})
+
+class _UploadTooLarge(HTTPException):
+    # An HTTPException so FastAPI's body parsing re-raises it instead of turning it into a 400
+    def __init__(self):
+        super().__init__(status_code=413)
+
+@app.exception_handler(_UploadTooLarge)
+async def upload_too_large(request: Request, exc: _UploadTooLarge):
+    return _upload_too_large()
+
+class _UploadSizeLimit:
+    """
+    Pure ASGI guard for the upload routes. A declared Content-Length over `max_bytes` is
+    refused before any body is read; otherwise body bytes are counted as they arrive, so a
+    chunked upload is cut off at the same limit. Every other path passes straight through.
+    """
+
+    def __init__(self, app, max_bytes, paths):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.paths = frozenset(paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            return await self.app(scope, receive, send)
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                if value.isdigit() and int(value) > self.max_bytes:
+                    return await _upload_too_large()(scope, receive, send)
+                break
+        seen = 0
+
+        async def counting_receive():
+            nonlocal seen
+            message = await receive()
+            if message["type"] == "http.request":
+                seen += len(message.get("body", b""))
+                if seen > self.max_bytes:
+                    raise _UploadTooLarge()
+            return message
+
+        await self.app(scope, counting_receive, send)
+
+# Added before CORS (so it sits inside it) and the 413 still carries CORS headers
+app.add_middleware(_UploadSizeLimit, max_bytes=MAX_UPLOAD_BYTES,
+                   paths=("/translate_audio/", "/translate_audio_multipart/"))
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -29,10 +115,122 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
-app.mount("/videos", StaticFiles(directory=STATIC_DIR, html=False), name="videos")
 
-# In-memory job store (run ONE instance/worker)
-video_jobs = {}
+class _ImmutableStaticFiles(StaticFiles):
+    """
+    Job renders (output_<job_id>.mp4) are written once under a unique name, so browsers/CDNs
+    may keep them forever. Anything else in the dir (e.g. the rewritable debug_ffmpeg probe)
+    keeps the default revalidating headers.
+    """
+
+    def file_response(self, full_path, *args, **kwargs):
+        response = super().file_response(full_path, *args, **kwargs)
+        name = os.path.basename(full_path)
+        if name.startswith("output_") and name.endswith(".mp4"):
+            response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        return response
+
+app.mount("/videos", _ImmutableStaticFiles(directory=STATIC_DIR, html=False), name="videos")
+
+class _MemoryJobs:
+    """
+    Bounded in-memory job store; the least recently used jobs are evicted past `maxsize`,
+    and finished (ready/error) jobs are dropped `ttl` seconds after they finish.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._data = OrderedDict()
+        self._done = OrderedDict()  # job_id -> expiry, in finish order
+        self._lock = threading.Lock()
+
+    def _purge(self, now):
+        # Expiries are appended in order, so only the head ever needs checking
+        while self._done:
+            job_id, expires = next(iter(self._done.items()))
+            if expires > now:
+                break
+            self._done.popitem(last=False)
+            self._data.pop(job_id, None)
+
+    def get(self, job_id, default=None):
+        with self._lock:
+            self._purge(time.monotonic())
+            job = self._data.get(job_id)
+            if job is None:
+                return default
+            self._data.move_to_end(job_id)
+            return job
+
+    def __setitem__(self, job_id, payload):
+        now = time.monotonic()
+        with self._lock:
+            self._data[job_id] = payload
+            self._data.move_to_end(job_id)
+            self._done.pop(job_id, None)
+            if payload.get("status") in ("ready", "error"):
+                self._done[job_id] = now + self._ttl
+            self._purge(now)
+            while len(self._data) > self._maxsize:
+                evicted, _ = self._data.popitem(last=False)
+                self._done.pop(evicted, None)
+
+class _RedisJobs:
+    """Dict-like job store kept in Redis hashes so any worker/replica can answer status polls."""
+
+    def __init__(self, client, ttl):
+        self._r = client
+        self._ttl = ttl
+
+    @staticmethod
+    def _key(job_id):
+        return "job:%s" % job_id
+
+    def get(self, job_id, default=None):
+        return self._r.hgetall(self._key(job_id)) or default
+
+    def __setitem__(self, job_id, payload):
+        key = self._key(job_id)
+        pipe = self._r.pipeline()
+        pipe.delete(key)
+        pipe.hset(key, mapping={k: "" if v is None else str(v) for k, v in payload.items()})
+        pipe.expire(key, self._ttl)
+        pipe.execute()
+
+# Job store: bounded in-memory LRU by default (run ONE instance/worker); set REDIS_URL
+# to share it across `uvicorn --workers N` processes on the same host
+MAX_JOBS = int(os.getenv("MAX_JOBS", "4096"))
+JOB_TTL = int(os.getenv("JOB_TTL", "3600"))
+REDIS_URL = os.getenv("REDIS_URL")
+video_jobs = _MemoryJobs(MAX_JOBS, JOB_TTL)
+if REDIS_URL:
+    try:
+        import redis  # type: ignore
+        _redis = redis.Redis.from_url(REDIS_URL, decode_responses=True)
+        _redis.ping()  # from_url is lazy; fail over here rather than on the first upload
+        video_jobs = _RedisJobs(_redis, JOB_TTL)
+    except Exception as _e:
+        logging.warning("Redis job store unavailable (%s). Falling back to in-memory.", _e)
+
+# Async handlers go through these: Redis round trips block, so they hop to a thread; the
+# in-memory store is a dict lookup and stays on the event loop
+async def _get_job(job_id):
+    if isinstance(video_jobs, _RedisJobs):
+        return await asyncio.to_thread(video_jobs.get, job_id)
+    return video_jobs.get(job_id)
+
+async def _set_job(job_id, payload):
+    if isinstance(video_jobs, _RedisJobs):
+        await asyncio.to_thread(video_jobs.__setitem__, job_id, payload)
+    else:
+        video_jobs[job_id] = payload
+
+# Admission control: at most MAX_PARALLEL_JOBS audio jobs in flight, extra uploads get 429
+MAX_PARALLEL_JOBS = int(os.getenv("MAX_PARALLEL_JOBS", str(os.cpu_count() or 2)))
+_job_slots = threading.BoundedSemaphore(MAX_PARALLEL_JOBS)
+# Long-lived job threads; one per slot, so an admitted job never waits in the queue
+_JOB_POOL = ThreadPoolExecutor(max_workers=MAX_PARALLEL_JOBS, thread_name_prefix="audio-job")
 
 # Feature flag: set USE_BROWSER=1 to enable Playwright fallback
 USE_BROWSER = os.getenv("USE_BROWSER", "0").lower() in ("1", "true", "yes")
@@ -44,26 +242,88 @@ if USE_BROWSER:
     except Exception as _e:
         logging.warning("Playwright import failed (%s). Falling back to HTTP-only.", _e)
 
+# Shared pool for SignASL lookups so a sentence's tokens are fetched concurrently
+SIGNASL_CONCURRENCY = int(os.getenv("SIGNASL_CONCURRENCY", "8"))
+_SIGNASL_POOL = ThreadPoolExecutor(max_workers=SIGNASL_CONCURRENCY, thread_name_prefix="signasl")
+
 # -------------------- Helpers --------------------
-def decode_data_uri(s):
-    s = (s or "").strip()
-    if s.startswith("data:"):
-        parts = s.split(",", 1)
-        s = parts[1] if len(parts) == 2 else ""
-    s = unquote(s)
-    s = s.replace("\n", "").replace("\r", "").replace(" ", "")
-    s = s.replace("-", "+").replace("_", "/")
-    s = re.sub(r"[^A-Za-z0-9+/=]", "", s)
-    pad = (4 - (len(s) % 4)) % 4
-    if pad:
-        s += "=" * pad
-    return base64.b64decode(s)
+# Every byte outside the (standard or URL-safe) base64 alphabet
+_B64_KEEP = (string.ascii_letters + string.digits + "+/=-_").encode()
+_B64_DELETE = bytes(b for b in range(256) if b not in _B64_KEEP)
+_B64_URLSAFE = bytes.maketrans(b"-_", b"+/")
+_PUNCT_TABLE = str.maketrans("", "", string.punctuation)
+
+# Source chars decoded per step (multiple of 4); bounds the decoded bytes held at once
+_B64_BLOCK = 1 << 16
+_LEADING_WS = re.compile(r"\s*")
+
+def _write_all(fd, data):
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+    return len(data)
+
+def decode_data_uri_to_file(s, path, digest=None):
+    """
+    Decode a data: URI / raw (URL-safe) base64 string straight into `path`, one block
+    at a time, so the decoded audio is never held in memory as a whole. If given,
+    `digest` (a hashlib object) is updated with every decoded block.
+    Returns the number of bytes written; raises ValueError on malformed input.
+    """
+    s = s or ""
+    # Skip the "data:...;base64," prefix by offset instead of copying the payload
+    start = _LEADING_WS.match(s).end()
+    if s.startswith("data:", start):
+        idx = s.find(",", start)
+        start = idx + 1 if idx != -1 else len(s)
+    if "%" in s:
+        s, start = unquote(s[start:]), 0
+
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        if hasattr(os, "posix_fallocate") and len(s) > start:
+            try:
+                # Let the kernel reserve the extent up front; trimmed to size below
+                os.posix_fallocate(fd, 0, (len(s) - start) * 3 // 4)
+            except OSError:
+                pass  # filesystem without fallocate support
+        written, carry = 0, b""
+        for i in range(start, len(s), _B64_BLOCK):
+            # One C-level pass maps URL-safe chars and drops whitespace/stray chars
+            b = carry + s[i:i + _B64_BLOCK].encode("ascii", "ignore").translate(_B64_URLSAFE, _B64_DELETE)
+            cut = len(b) - len(b) % 4
+            carry = b[cut:]
+            if cut:
+                block = _b64decode(b[:cut], validate=False)
+                if digest is not None:
+                    digest.update(block)
+                written += _write_all(fd, block)
+        if carry:
+            # Only the <4-char tail is ever padded, never a copy of the whole payload
+            block = _b64decode(carry + b"=" * (-len(carry) & 3), validate=False)
+            if digest is not None:
+                digest.update(block)
+            written += _write_all(fd, block)
+        os.ftruncate(fd, written)
+        return written
+    finally:
+        os.close(fd)
 
 def _strip_punct(t):
-    return t.translate(str.maketrans("", "", string.punctuation)).lower()
+    return t.translate(_PUNCT_TABLE).lower()
 
 _SIGNASL_BASES = ("https://www.signasl.org/", "https://signasl.org/")
 
+# Media URL patterns for the HTML scrape and browser fallback (compiled once).
+# One alternation so the page is scanned in a single pass: media attributes (may be
+# relative) or bare absolute URLs anywhere in the markup.
+_MEDIA_URL_RE = re.compile(
+    r'(?:src|data-src|srcset|data-video|data-hls)=["\'](?P<rel>[^"\']+?\.(?:mp4|webm|m3u8)(?:\?[^"\']*)?)["\']'
+    r'|(?P<abs>https?://[^\s"\'<>]+?\.(?:mp4|webm|m3u8)\b)',
+    re.IGNORECASE | re.ASCII,
+)
+_MEDIA_RE = re.compile(r'\.(mp4|webm|m3u8)(?:\?|$)', re.IGNORECASE | re.ASCII)
+
 def _browser_session():
     s = requests.Session()
     s.headers.update({
@@ -78,61 +338,108 @@ def _browser_session():
         "Cache-Control": "no-cache",
         "Pragma": "no-cache",
     })
+    # Keep-alive pool sized for the lookup pool so concurrent tokens reuse connections
+    s.mount("https://", HTTPAdapter(
+        pool_connections=len(_SIGNASL_BASES),
+        pool_maxsize=max(SIGNASL_CONCURRENCY, 32),
+        max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=(502, 503, 504)),
+    ))
     return s
 
+# (connect, read): a dead host fails in ~3 s instead of holding a pool thread for the read budget
+_JSON_TIMEOUT = (3.05, 8)
+_HTML_TIMEOUT = (3.05, 12)
+
+# One session shared by every lookup (requests.Session is safe for concurrent GETs)
+_SESSION = _browser_session()
+atexit.register(_SESSION.close)
+
+class _CircuitBreaker:
+    """Opens after `fail_max` consecutive failures and lets one call through every `reset_timeout` s."""
+
+    def __init__(self, fail_max=5, reset_timeout=60):
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self._fails = 0
+        self._opened_at = None
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.time() - self._opened_at >= self.reset_timeout:
+                self._opened_at = time.time()  # half-open: one probe per window
+                return True
+            return False
+
+    def record(self, ok):
+        with self._lock:
+            if ok:
+                self._fails, self._opened_at = 0, None
+            else:
+                self._fails += 1
+                if self._fails >= self.fail_max:
+                    self._opened_at = time.time()
+
+# Repeated 5xx/timeouts from signasl.org disable the HTML scrape for a minute
+_scrape_breaker = _CircuitBreaker(fail_max=5, reset_timeout=60)
+
 def _fetch_signasl_urls_http(token):
+    """
+    Returns the media URLs for `token`, or None when the site could not give
+    a definite answer (scrape failed or circuit open) and the miss should not be cached.
+    """
     token = _strip_punct(token or "")
     if not token:
         return []
 
-    sess = _browser_session()
-    found = []
+    sess = _SESSION
+    seen, out = set(), []  # de-duped as collected, order preserved
 
-    # 1) JSON API (if exposed)
+    # 1) JSON API (if exposed); first host with results wins
     for base in _SIGNASL_BASES:
         url = urljoin(base, "api/sign/" + token)
         try:
-            rj = sess.get(url, timeout=8, allow_redirects=True)
+            rj = sess.get(url, timeout=_JSON_TIMEOUT, allow_redirects=True)
             if rj.ok:
-                data = rj.json()
+                data = orjson.loads(rj.content)
                 if isinstance(data, list):
                     for item in data:
                         u = (item or {}).get("video_url")
-                        if u:
-                            found.append(u)
+                        if u and u not in seen:
+                            seen.add(u)
+                            out.append(u)
         except Exception as e:
             logging.debug("JSON %s failed (%s): %s", url, token, e)
-
-    # 2) HTML scrape (supports mp4/webm/m3u8)
-    attr_re = re.compile(
-        r'(?:src|data-src|srcset|data-video|data-hls)=["\']([^"\']+?\.(?:mp4|webm|m3u8)(?:\?[^"\']*)?)["\']',
-        re.IGNORECASE,
-    )
-    abs_re = re.compile(
-        r'https?://[^\s"\'<>]+?\.(?:mp4|webm|m3u8)\b',
-        re.IGNORECASE,
-    )
-
-    for base in _SIGNASL_BASES:
+        if out:
+            break
+
+    # 2) HTML scrape (supports mp4/webm/m3u8), canonical host only, on a JSON miss
+    if not out:
+        if not _scrape_breaker.allow():
+            return None
+        base = _SIGNASL_BASES[0]
         page = urljoin(base, "sign/" + token)
         try:
-            rh = sess.get(page, timeout=12, allow_redirects=True)
-            if not rh.ok:
-                continue
-            html = rh.text
-            for m in attr_re.findall(html):
-                found.append(urljoin(base, m))
-            for m in abs_re.findall(html):
-                found.append(m)
+            rh = sess.get(page, timeout=_HTML_TIMEOUT, allow_redirects=True)
         except Exception as e:
             logging.debug("HTML %s failed (%s): %s", page, token, e)
-
-    # de-dupe, preserve order
-    seen, out = set(), []
-    for u in found:
-        if u not in seen:
-            out.append(u)
-            seen.add(u)
+            _scrape_breaker.record(False)
+            return None
+        # Only a 404 or a 2xx is an answer; 429/403 are rate limits or bot blocks, not
+        # "no such sign", and like 5xx must not be cached as a miss
+        definite = rh.ok or rh.status_code == 404
+        _scrape_breaker.record(definite)
+        if not definite:
+            return None
+        if rh.ok:
+            for m in _MEDIA_URL_RE.finditer(rh.text):
+                rel = m.group("rel")
+                u = urljoin(base, rel) if rel else m.group("abs")
+                if u not in seen:
+                    seen.add(u)
+                    out.append(u)
     return out
 
 def _fetch_signasl_urls_browser(token):
@@ -179,8 +486,7 @@ def _fetch_signasl_urls_browser(token):
         return []
 
     # filter only media extensions we handle
-    media_re = re.compile(r'\.(mp4|webm|m3u8)(?:\?|$)', re.IGNORECASE)
-    urls = [u for u in urls if media_re.search(u)]
+    urls = [u for u in urls if _MEDIA_RE.search(u)]
 
     # de-dupe preserve order
     seen, out = set(), []
@@ -189,97 +495,365 @@ def _fetch_signasl_urls_browser(token):
             out.append(u); seen.add(u)
     return out
 
+# -------------------- Persistent lookup cache --------------------
+# token -> JSON list of URLs; survives restarts and is shared by all lookup threads.
+# Misses are stored as an empty list so rare tokens are not re-queried either, but expire
+# sooner so words SignASL adds later (or misspellings that start resolving) get picked up.
+SIGNASL_CACHE_PATH = os.getenv("SIGNASL_CACHE_PATH", os.path.join("cache", "signasl.sqlite"))
+SIGNASL_CACHE_TTL = 60 * 60 * 24 * 30
+SIGNASL_NEGATIVE_TTL = 60 * 60 * 24
+os.makedirs(os.path.dirname(SIGNASL_CACHE_PATH) or ".", exist_ok=True)
+_cache_lock = threading.Lock()
+_cache_db = sqlite3.connect(SIGNASL_CACHE_PATH, isolation_level=None, check_same_thread=False)
+# WAL: appends to one log instead of rewriting pages + journal on every insert
+_cache_db.execute("PRAGMA journal_mode=WAL")
+_cache_db.execute("PRAGMA synchronous=NORMAL")
+_cache_db.execute(
+    "CREATE TABLE IF NOT EXISTS signasl (token TEXT PRIMARY KEY, urls TEXT NOT NULL, expires REAL NOT NULL)"
+)
+atexit.register(_cache_db.close)
+
+def _cache_get(token):
+    """Returns (urls, expires) for an unexpired entry, else None."""
+    with _cache_lock:
+        row = _cache_db.execute("SELECT urls, expires FROM signasl WHERE token = ?", (token,)).fetchone()
+    if row is None or row[1] < time.time():
+        return None
+    return orjson.loads(row[0]), row[1]
+
+def _cache_set(token, urls):
+    expires = time.time() + (SIGNASL_CACHE_TTL if urls else SIGNASL_NEGATIVE_TTL)
+    with _cache_lock:
+        _cache_db.execute(
+            "INSERT OR REPLACE INTO signasl (token, urls, expires) VALUES (?, ?, ?)",
+            (token, orjson.dumps(urls), expires),
+        )
+    return expires
+
+# In-process LRU in front of the SQLite cache. Entries carry the SQLite expiry, so a
+# long-lived worker still re-queries misses after a day and hits after 30 days.
+_TOKEN_MEMO_MAX = 4096
+_token_memo = OrderedDict()  # token -> (expires, urls tuple)
+_token_memo_lock = threading.Lock()
+
+def _lookup_token(token):
+    """URLs for a normalized token, or None when the site gave no definite answer (not cached)."""
+    now = time.time()
+    with _token_memo_lock:
+        hit = _token_memo.get(token)
+        if hit is not None and hit[0] > now:
+            _token_memo.move_to_end(token)
+            return hit[1]
+
+    cached = _cache_get(token)
+    if cached is not None:
+        urls, expires = tuple(cached[0]), cached[1]
+    else:
+        # Fast path: HTTP scrape
+        fetched = _fetch_signasl_urls_http(token)
+        definite = fetched is not None
+        if not fetched:
+            # Slow path: headless browser (if enabled)
+            fetched = _fetch_signasl_urls_browser(token)
+        if not (fetched or definite):
+            return None
+        urls = tuple(fetched)
+        expires = _cache_set(token, list(urls))
+
+    with _token_memo_lock:
+        _token_memo[token] = (expires, urls)
+        _token_memo.move_to_end(token)
+        while len(_token_memo) > _TOKEN_MEMO_MAX:
+            _token_memo.popitem(last=False)
+    return urls
+
 def _fetch_signasl_urls_for_token(token):
-    # Fast path: HTTP scrape
-    urls = _fetch_signasl_urls_http(token)
-    if urls:
-        return urls
-    # Slow path: headless browser (if enabled)
-    return _fetch_signasl_urls_browser(token)
-
-def translate_text_to_sign(sentence):
-    words = _strip_punct(sentence or "").split()
+    token = _strip_punct(token or "")
+    if not token:
+        return []
+    return list(_lookup_token(token) or ())
+
+# Fingerspelling table (letters/digits -> URLs) baked in at build time by build_letter_urls.py
+LETTER_URLS_PATH = os.getenv("LETTER_URLS_PATH", "letter_urls.json")
+LETTER_URLS = {}
+if os.path.exists(LETTER_URLS_PATH):
+    try:
+        with open(LETTER_URLS_PATH) as f:
+            LETTER_URLS = {k: v for k, v in json.load(f).items() if v}
+    except Exception as _e:
+        logging.warning("Could not load %s (%s). Letters will be looked up online.", LETTER_URLS_PATH, _e)
+
+def translate_words_to_sign(words):
+    """
+    Look up SignASL URLs for a list of words, one URL list per word.
+    Each distinct word is looked up once, concurrently; words with no hit are
+    fingerspelled, with the distinct letters of all misses fetched in a second batch.
+    """
+    tokens = [_strip_punct(w or "").split() for w in words]
+    # Fetch each distinct token once; results are replayed positionally below
+    uniq = list(dict.fromkeys(t for ts in tokens for t in ts))
+    hits = dict(zip(uniq, _SIGNASL_POOL.map(_fetch_signasl_urls_for_token, uniq)))
+
+    letters = list(dict.fromkeys(ch for t in uniq if not hits[t] for ch in t if ch not in LETTER_URLS))
+    letter_hits = dict(LETTER_URLS)
+    letter_hits.update(zip(letters, _SIGNASL_POOL.map(_fetch_signasl_urls_for_token, letters)))
+
     out = []
-    for w in words:
-        hits = _fetch_signasl_urls_for_token(w)
-        if hits:
-            out.extend(hits)
-            continue
-        # fallback: letters
-        for ch in w:
-            hits_ch = _fetch_signasl_urls_for_token(ch)
-            if hits_ch:
-                out.extend(hits_ch)
+    for ts in tokens:
+        urls = []
+        for t in ts:
+            if hits[t]:
+                urls.extend(hits[t])
+                continue
+            # fallback: letters
+            for ch in t:
+                urls.extend(letter_hits.get(ch) or [])
+        out.append(urls)
     return out
 
 # -------------------- Schema --------------------
 class AudioPayload(BaseModel):
     filename: str
-    content_base64: str  # data:...;base64,... or raw base64
+    content_base64: str = Field(..., max_length=MAX_UPLOAD_BYTES)  # data:...;base64,... or raw base64
+
+# -------------------- Result cache --------------------
+# sha256(decoded audio) -> finished job, so re-uploading the same recording returns the
+# earlier video immediately. Lives next to the lookup cache in the same SQLite file.
+AUDIO_RESULT_TTL = SIGNASL_CACHE_TTL
+# ?cache= override per upload (mostly for development)
+CacheMode = Literal["enabled", "read_only", "write_only", "disabled"]
+_cache_db.execute(
+    "CREATE TABLE IF NOT EXISTS audio_results "
+    "(digest TEXT PRIMARY KEY, video_url TEXT NOT NULL, transcript TEXT NOT NULL, expires REAL NOT NULL)"
+)
+
+def _audio_result_get(digest):
+    with _cache_lock:
+        row = _cache_db.execute(
+            "SELECT video_url, transcript, expires FROM audio_results WHERE digest = ?", (digest,)
+        ).fetchone()
+    if row is None or row[2] < time.time():
+        return None
+    # The rendered file may have been cleaned up since; then it is a miss
+    if not os.path.isfile(os.path.join(STATIC_DIR, os.path.basename(row[0]))):
+        return None
+    return {"video_url": row[0], "transcript": row[1]}
+
+def _audio_result_set(digest, job):
+    with _cache_lock:
+        _cache_db.execute(
+            "INSERT OR REPLACE INTO audio_results (digest, video_url, transcript, expires) VALUES (?, ?, ?, ?)",
+            (digest, job["video_url"], job.get("transcript") or "", time.time() + AUDIO_RESULT_TTL),
+        )
 
 # -------------------- Routes --------------------
-@app.post("/translate_audio/", status_code=200)
-async def translate_audio(data: AudioPayload):
-    job_id = str(uuid.uuid4())
-    video_jobs[job_id] = {"status": "processing", "transcript": ""}
+_AUDIO_EXTS = {".mp3", ".wav", ".m4a", ".aac", ".mp4"}
+_UPLOAD_CHUNK = 1 << 20
+
+def _temp_audio_path(job_id, filename):
+    ext = os.path.splitext(filename or "")[1].lower()
+    if ext not in _AUDIO_EXTS:
+        ext = ".mp3"
+    return "temp_%s%s" % (job_id, ext)
 
+def _too_many_jobs():
+    return JSONResponse(status_code=429, content={"status": "error", "error": "Too many jobs in progress"})
+
+def _run_audio_job(job_id, temp_audio_path, digest=None):
+    try:
+        try:
+            process_audio_worker(job_id, temp_audio_path, video_jobs, translate_words_to_sign, STATIC_DIR)
+        except Exception as e:  # the worker records its own failures; this is whatever escaped it
+            logging.error("❌ [%s] worker crashed: %s", job_id, e)
+            video_jobs[job_id] = {"status": "error", "error": str(e)}
+            return
+        if digest is None:
+            return
+        job = video_jobs.get(job_id)
+        if job and job.get("status") == "ready":
+            try:
+                _audio_result_set(digest, job)
+            except Exception as e:
+                logging.warning("[%s] result cache write failed: %s", job_id, e)
+    finally:
+        _job_slots.release()
+
+def _start_audio_job(job_id, temp_audio_path, digest=None):
+    # Caller must already hold a slot from _job_slots; the job releases it when done
+    _JOB_POOL.submit(_run_audio_job, job_id, temp_audio_path, digest)
+
+async def _fail_upload(job_id, temp_audio_path, error):
+    """Drop a partially written upload and mark its job failed so pollers stop waiting."""
     try:
-        audio_bytes = decode_data_uri(data.content_base64)
+        os.remove(temp_audio_path)
+    except OSError:
+        pass
+    try:
+        await _set_job(job_id, {"status": "error", "error": error})
+    except Exception as e:  # the store itself may be what failed; keep the original error
+        logging.warning("[%s] could not record failed upload: %s", job_id, e)
+
+async def _dispatch_upload(job_id, temp_audio_path, digest, cache):
+    """
+    Answers from the result cache when allowed, otherwise queues the job.
+    Returns (body, queued); once queued the job owns the caller's slot.
+    """
+    if cache in ("enabled", "read_only"):
+        hit = await asyncio.to_thread(_audio_result_get, digest)
+        if hit:
+            try:
+                os.remove(temp_audio_path)
+            except OSError:
+                pass
+            await _set_job(job_id, {"status": "ready", **hit})
+            return {"job_id": job_id, "status": "ready"}, False
+    try:
+        _start_audio_job(job_id, temp_audio_path, digest if cache in ("enabled", "write_only") else None)
     except Exception:
-        video_jobs[job_id] = {"status": "error", "error": "Invalid base64"}
-        return JSONResponse(status_code=400, content={"status": "error", "error": "Invalid base64"})
+        await _fail_upload(job_id, temp_audio_path, "Could not queue job")
+        raise
+    return {"job_id": job_id}, True
 
-    ext = os.path.splitext(data.filename or "")[1].lower()
-    if ext not in {".mp3", ".wav", ".m4a", ".aac", ".mp4"}:
-        ext = ".mp3"
-    temp_audio_path = "temp_%s%s" % (job_id, ext)
-    with open(temp_audio_path, "wb") as f:
-        f.write(audio_bytes)
+def _hash_and_write(dst, digest, chunk):
+    digest.update(chunk)
+    dst.write(chunk)
 
-    from worker import process_audio_worker
-    threading.Thread(
-        target=process_audio_worker,
-        args=(job_id, temp_audio_path, video_jobs, translate_text_to_sign, STATIC_DIR),
-        daemon=True,
-    ).start()
+@app.post("/translate_audio/", status_code=200)
+async def translate_audio(data: AudioPayload, cache: CacheMode = "enabled"):
+    """Legacy JSON/base64 upload. Prefer /translate_audio_multipart/ for new clients."""
+    if not _job_slots.acquire(blocking=False):
+        return _too_many_jobs()
+    # Everything up to the pool handoff runs under this try, so no failure can leak the slot
+    queued = False
+    try:
+        job_id = secrets.token_hex(16)
+        await _set_job(job_id, {"status": "processing", "transcript": ""})
+
+        temp_audio_path = _temp_audio_path(job_id, data.filename)
+        digest = hashlib.sha256()
+        try:
+            await asyncio.to_thread(decode_data_uri_to_file, data.content_base64, temp_audio_path, digest)
+        except ValueError:
+            await _fail_upload(job_id, temp_audio_path, "Invalid base64")
+            return JSONResponse(status_code=400, content={"status": "error", "error": "Invalid base64"})
+        except Exception:
+            await _fail_upload(job_id, temp_audio_path, "Upload failed")
+            raise
+
+        body, queued = await _dispatch_upload(job_id, temp_audio_path, digest.hexdigest(), cache)
+        return _json_response(body)
+    finally:
+        if not queued:
+            _job_slots.release()
+
+@app.post("/translate_audio_multipart/", status_code=200)
+async def translate_audio_multipart(f: UploadFile = File(...), cache: CacheMode = "enabled"):
+    """Preferred upload: raw multipart file streamed to disk, no base64/JSON overhead."""
+    if not _job_slots.acquire(blocking=False):
+        return _too_many_jobs()
+    # Everything up to the pool handoff runs under this try, so no failure can leak the slot
+    queued = False
+    try:
+        job_id = secrets.token_hex(16)
+        await _set_job(job_id, {"status": "processing", "transcript": ""})
 
-    return {"job_id": job_id}
+        temp_audio_path = _temp_audio_path(job_id, f.filename)
+        digest = hashlib.sha256()
+        try:
+            with open(temp_audio_path, "wb") as dst:
+                while True:
+                    chunk = await f.read(_UPLOAD_CHUNK)
+                    if not chunk:
+                        break
+                    await asyncio.to_thread(_hash_and_write, dst, digest, chunk)
+        except Exception:
+            await _fail_upload(job_id, temp_audio_path, "Upload failed")
+            raise
+
+        body, queued = await _dispatch_upload(job_id, temp_audio_path, digest.hexdigest(), cache)
+        return _json_response(body)
+    finally:
+        if not queued:
+            _job_slots.release()
+
+def _etag_matches(if_none_match, etag):
+    # If-None-Match uses weak comparison: any listed tag, W/ or not, or "*" for an existing job
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == etag:
+            return True
+    return False
 
 @app.get("/video_status/{job_id}")
-def video_status(job_id: str):
-    job = video_jobs.get(job_id)
+async def video_status(job_id: str, request: Request):
+    job = await _get_job(job_id)
     if not job:
-        return {"status": "not_found"}
-    if job.get("status") == "ready":
-        return {
+        return _json_response({"status": "not_found"})
+    status = job.get("status")
+    # The body only changes when the status does, so pollers revalidate with If-None-Match
+    # and get an empty 304 until the job moves on
+    etag = '"%s"' % hashlib.sha1(("%s:%s" % (job_id, status)).encode()).hexdigest()
+    if status == "ready":
+        # A ready job never changes again, but its body carries the user's transcript, so
+        # only the client may keep it (public/immutable is for the /videos renders alone)
+        headers = {"ETag": etag, "Cache-Control": "private, max-age=5"}
+    else:
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    if status == "ready":
+        content = {
             "status": "ready",
             "video_url": job.get("video_url"),
             "transcript": job.get("transcript", ""),
         }
-    if job.get("status") == "error":
-        return {"status": "error", "error": job.get("error")}
-    return {"status": "processing"}
+    elif status == "error":
+        content = {"status": "error", "error": job.get("error")}
+    else:
+        content = {"status": "processing"}
+    return _json_response(content, headers=headers)
+
+def cleanup_stale_uploads():
+    # Temp audio of jobs that died with a previous process; the age check spares
+    # uploads still being processed by sibling workers
+    cutoff = time.time() - JOB_TTL
+    exts = tuple(_AUDIO_EXTS)
+    with os.scandir(".") as it:
+        for e in it:
+            if e.name.startswith("temp_") and e.name.endswith(exts) and e.is_file(follow_symlinks=False):
+                try:
+                    if e.stat().st_mtime < cutoff:
+                        os.remove(e.path)
+                except OSError:
+                    pass
+
+def warm_signasl_cache():
+    # Fingerspelling letters are the most common fallback; fetch them in the background
+    for ch in string.ascii_lowercase:
+        if ch not in LETTER_URLS:
+            _SIGNASL_POOL.submit(_fetch_signasl_urls_for_token, ch)
 
 @app.get("/")
-def health():
-    return {"status": "ok"}
+async def health():
+    return _json_response({"status": "ok"})
 
 # -------------------- Optional debug endpoints --------------------
 @app.get("/debug_ffmpeg")
 def debug_ffmpeg():
-    import subprocess, shutil
-    ffmpeg = shutil.which("ffmpeg")
-    if not ffmpeg:
-        try:
-            import imageio_ffmpeg
-            ffmpeg = imageio_ffmpeg.get_ffmpeg_exe()
-        except Exception:
-            return JSONResponse(status_code=500, content={"ok": False, "error": "ffmpeg not found"})
+    ffmpeg = _ffmpeg_bin()
+    if not os.path.isabs(ffmpeg):
+        return JSONResponse(status_code=500, content={"ok": False, "error": "ffmpeg not found"})
     out = os.path.join(STATIC_DIR, "ffmpeg_test.mp4")
-    cmd = [ffmpeg, "-y", "-f", "lavfi", "-i", "color=c=black:s=320x240:d=1",
+    # "-v error" keeps stderr empty on success; it is only read back when the probe fails
+    cmd = [ffmpeg, "-y", "-v", "error", "-f", "lavfi", "-i", "color=c=black:s=320x240:d=1",
            "-c:v", "libx264", "-pix_fmt", "yuv420p", out]
     try:
-        subprocess.run(cmd, check=True, capture_output=True)
+        cp = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        if cp.returncode != 0:
+            err = cp.stderr.decode(errors="ignore")[-400:]
+            return JSONResponse(status_code=500, content={"ok": False, "error": err})
         return {"ok": True, "url": "/videos/ffmpeg_test.mp4", "size": os.path.getsize(out)}
     except Exception as e:
         return JSONResponse(status_code=500, content={"ok": False, "error": str(e)})
@@ -0,0 +1,19 @@
+# build_letter_urls.py
+# One-shot build step: resolve SignASL URLs for every fingerspelling letter/digit
+# and write them to letter_urls.json, which app.py loads at import.
+import json
+import string
+import logging
+
+from app import LETTER_URLS_PATH, _fetch_signasl_urls_for_token, _SIGNASL_POOL
+
+def main():
+    chars = string.ascii_lowercase + string.digits
+    table = dict(zip(chars, _SIGNASL_POOL.map(_fetch_signasl_urls_for_token, chars)))
+    table = {ch: urls for ch, urls in table.items() if urls}
+    with open(LETTER_URLS_PATH, "w") as f:
+        json.dump(table, f, indent=1, sort_keys=True)
+    logging.info("Wrote %d/%d letter URLs to %s", len(table), len(chars), LETTER_URLS_PATH)
+
+if __name__ == "__main__":
+    main()
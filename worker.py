@@ -1,14 +1,22 @@
 
 # worker.py
 import os
+import re
 import time
 import json
+import atexit
 import shutil
+import hashlib
+import secrets
 import logging
 import tempfile
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 
@@ -78,33 +86,76 @@ def transcribe_with_assemblyai(audio_path: str) -> dict:
 
 
 # ---------- Media fetch/convert (mp4/webm/m3u8) ----------
+# Scratch dir for per-job clips/segments (system temp dir by default). Point it at a tmpfs
+# such as /dev/shm only if it is sized for MAX_PARALLEL_JOBS renders: container tmpfs is
+# often 64 MiB and counts against the memory limit, and a full one drops clips.
+MEDIA_TMP_DIR = os.getenv("MEDIA_TMP_DIR") or None
+
+def _tmp_path(suffix: str) -> str:
+    fd, path = tempfile.mkstemp(suffix=suffix, dir=MEDIA_TMP_DIR)
+    os.close(fd)
+    return path
+
+@lru_cache(maxsize=1)
 def _ffmpeg_bin() -> str:
+    """Absolute ffmpeg path, resolved once per process (PATH scan / imageio-ffmpeg)."""
     ff = shutil.which("ffmpeg")
     if ff:
         return ff
     try:
         import imageio_ffmpeg
-        ff = imageio_ffmpeg.get_ffmpeg_exe()
-        # Help MoviePy find it too
-        os.environ["IMAGEIO_FFMPEG_EXE"] = ff
-        os.environ["FFMPEG_BINARY"] = ff
-        return ff
+        return imageio_ffmpeg.get_ffmpeg_exe()
     except Exception:
         return "ffmpeg"  # hope it's in PATH
 
+_CLIP_UA = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+            "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36")
+
+def _clip_session() -> requests.Session:
+    s = requests.Session()
+    s.headers.update({"User-Agent": _CLIP_UA, "Referer": "https://www.signasl.org/"})
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=(502, 503, 504)),
+    )
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    return s
+
+# Clip downloads for every job share one keep-alive pool to the media hosts
+_CLIP_SESSION = _clip_session()
+atexit.register(_CLIP_SESSION.close)
+
+# Bounded across all jobs so concurrent renders can't exhaust the session pool
+CLIP_DOWNLOAD_CONCURRENCY = int(os.getenv("CLIP_DOWNLOAD_CONCURRENCY", "8"))
+_DOWNLOAD_POOL = ThreadPoolExecutor(max_workers=CLIP_DOWNLOAD_CONCURRENCY, thread_name_prefix="clip-dl")
+_DOWNLOAD_CHUNK = 1 << 16
+
+def _stream_to_file(url: str, suffix: str) -> str:
+    """Streams `url` into a new temp file in chunks (never holds the whole clip in memory)."""
+    fn = _tmp_path(suffix)
+    try:
+        with _CLIP_SESSION.get(url, timeout=(3.05, 20), stream=True) as r:
+            r.raise_for_status()
+            with open(fn, "wb") as f:
+                for chunk in r.iter_content(_DOWNLOAD_CHUNK):
+                    f.write(chunk)
+    except Exception:
+        os.remove(fn)
+        raise
+    return fn
+
 def _download_clip_to_mp4(url: str) -> str:
     """
     Returns a local **.mp4** path for the given media URL.
     - For HLS (.m3u8): uses ffmpeg to fetch & mux.
     - For .mp4/.webm: downloads, converts webm→mp4 if needed.
     """
-    import requests
-
-    ua = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
-          "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36")
+    ua = _CLIP_UA
 
     if url.lower().endswith(".m3u8"):
-        out = tempfile.NamedTemporaryFile(delete=False, suffix=".mp4").name
+        out = _tmp_path(".mp4")
         cmd = [
             _ffmpeg_bin(), "-y",
             "-headers", f"User-Agent: {ua}\r\nAccept: */*\r\nReferer: https://www.signasl.org/\r\n",
@@ -120,21 +171,14 @@ def _download_clip_to_mp4(url: str) -> str:
         return out
 
     # Direct file
-    r = requests.get(url, timeout=20, headers={"User-Agent": ua, "Referer": "https://www.signasl.org/"})
-    r.raise_for_status()
     lower = url.lower()
     if lower.endswith(".mp4"):
-        fn = tempfile.NamedTemporaryFile(delete=False, suffix=".mp4").name
-        with open(fn, "wb") as f:
-            f.write(r.content)
-        return fn
+        return _stream_to_file(url, ".mp4")
 
     # webm -> mp4
     if lower.endswith(".webm"):
-        webm = tempfile.NamedTemporaryFile(delete=False, suffix=".webm").name
-        with open(webm, "wb") as f:
-            f.write(r.content)
-        out = tempfile.NamedTemporaryFile(delete=False, suffix=".mp4").name
+        webm = _stream_to_file(url, ".webm")
+        out = _tmp_path(".mp4")
         cmd = [_ffmpeg_bin(), "-y", "-i", webm, "-c:v", "libx264", "-pix_fmt", "yuv420p", "-an", out]
         logging.info("♻️ webm→mp4 %s", out)
         cp = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
@@ -147,7 +191,7 @@ def _download_clip_to_mp4(url: str) -> str:
         return out
 
     # Unknown extension → try ffmpeg directly
-    out = tempfile.NamedTemporaryFile(delete=False, suffix=".mp4").name
+    out = _tmp_path(".mp4")
     cmd = [_ffmpeg_bin(), "-y", "-i", url, "-c:v", "libx264", "-pix_fmt", "yuv420p", "-an", out]
     logging.info("⚙️ ffmpeg generic fetch → %s", out)
     cp = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
@@ -156,39 +200,220 @@ def _download_clip_to_mp4(url: str) -> str:
     return out
 
 
+# ---------- Segment render + concat ----------
+# Every segment is encoded with identical parameters so the final join is a stream copy
+SEGMENT_SIZE = (640, 360)
+SEGMENT_FPS = 24
+# Segments are short, low-res and only ever stream-copied afterwards, so encode speed wins
+SEGMENT_PRESET = os.getenv("SEGMENT_PRESET", "ultrafast")
+# Clips are sped up / slowed down by at most this factor to fit their slot; beyond that
+# the sign would be unreadable, so the remainder is trimmed or held instead
+SEGMENT_MAX_RETIME = float(os.getenv("SEGMENT_MAX_RETIME", "2.0"))
+
+_DURATION_RE = re.compile(rb"Duration: (\d+):(\d{2}):(\d{2}(?:\.\d+)?)")
+
+def _clip_duration(path: str) -> float:
+    """Container duration in seconds from ffmpeg's input banner (0.0 if unknown)."""
+    cp = subprocess.run([_ffmpeg_bin(), "-hide_banner", "-i", path],
+                        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    m = _DURATION_RE.search(cp.stderr)
+    if not m:
+        return 0.0
+    hh, mm, ss = m.groups()
+    return int(hh) * 3600 + int(mm) * 60 + float(ss)
+
+def _render_segment(src: str, dur: float, out: str, src_dur: float = 0.0) -> None:
+    """
+    Scales/pads `src` to SEGMENT_SIZE@SEGMENT_FPS and fits it to exactly `dur` seconds:
+    retimed with setpts (within SEGMENT_MAX_RETIME) when `src_dur` is known, then
+    trimmed, or with its last frame held.
+    """
+    w, h = SEGMENT_SIZE
+    speed = 1.0
+    if src_dur > 0:
+        speed = min(max(src_dur / dur, 1 / SEGMENT_MAX_RETIME), SEGMENT_MAX_RETIME)
+    vf = (
+        f"setpts=(PTS-STARTPTS)/{speed:.4f},"
+        f"scale={w}:{h}:force_original_aspect_ratio=decrease,"
+        f"pad={w}:{h}:(ow-iw)/2:(oh-ih)/2,fps={SEGMENT_FPS},"
+        f"tpad=stop_mode=clone:stop_duration={dur:.3f},format=yuv420p"
+    )
+    cmd = [
+        _ffmpeg_bin(), "-y", "-i", src,
+        "-vf", vf, "-t", f"{dur:.3f}", "-an",
+        "-c:v", "libx264", "-preset", SEGMENT_PRESET, "-threads", "0",
+        out,
+    ]
+    cp = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    if cp.returncode != 0:
+        raise RuntimeError(f"ffmpeg segment failed: {cp.stderr.decode(errors='ignore')[-400:]}")
+
+
+# ---------- On-disk media caches ----------
+# Same clips + same timings + same segment settings => byte-identical output, so repeated
+# phrases are served by hard-linking a previous render. Bounded to RENDER_CACHE_MAX files.
+RENDER_CACHE_DIR = os.getenv("RENDER_CACHE_DIR", os.path.join("cache", "renders"))
+RENDER_CACHE_MAX = int(os.getenv("RENDER_CACHE_MAX", "500"))
+# Downloaded (and webm/HLS-converted) clips keyed by sha256(url); the sign vocabulary is
+# small, so after warm-up most jobs download nothing. Bounded to CLIP_CACHE_MAX files.
+CLIP_CACHE_DIR = os.getenv("CLIP_CACHE_DIR", os.path.join("cache", "clips"))
+CLIP_CACHE_MAX = int(os.getenv("CLIP_CACHE_MAX", "2000"))
+# Clip-cache file name -> duration (s). A cached clip never changes, so warm clips skip the
+# per-clip ffmpeg probe entirely; cleared wholesale if it outgrows the cache it mirrors.
+_CLIP_DURATIONS = {}
+# Per-caller `.use` links and in-flight `.tmp` copies are normally removed within one job;
+# any older than this were orphaned by a crash and are swept with the cache.
+_SCRATCH_MAX_AGE = 6 * 3600
+
+def _scratch_name(cached: str, ext: str) -> str:
+    # Random rather than pid/thread based: idents are reused, and a clash must never look like a miss
+    return f"{cached}.{secrets.token_hex(8)}.{ext}"
+
+def _plan_key(video_plan) -> str:
+    # Plan order matters (it is the sentence order), so the key is never sorted
+    h = hashlib.sha256(f"{SEGMENT_SIZE}|{SEGMENT_FPS}|{SEGMENT_PRESET}|{SEGMENT_MAX_RETIME}".encode())
+    for url, dur in video_plan:
+        h.update(f"\n{url}|{max(float(dur), 0.08):.3f}".encode())
+    return h.hexdigest()
+
+def _link_or_copy(src: str, dst: str) -> None:
+    try:
+        os.link(src, dst)
+    except OSError:  # different filesystem / no hard links
+        shutil.copyfile(src, dst)
+
+def _render_cache_fetch(key: str, output_path: str) -> bool:
+    cached = os.path.join(RENDER_CACHE_DIR, key + ".mp4")
+    try:
+        _link_or_copy(cached, output_path)
+        os.utime(cached)  # mtime doubles as the LRU clock for the sweep
+        return True
+    except OSError:
+        return False
+
+def _cache_store(src: str, cache_dir: str, name: str, max_files: int) -> None:
+    """Publishes a copy of `src` as cache_dir/name, then trims the dir to `max_files` (LRU by mtime)."""
+    cached = os.path.join(cache_dir, name)
+    tmp = _scratch_name(cached, "tmp")
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        _link_or_copy(src, tmp)
+        os.replace(tmp, cached)  # atomic, so concurrent writers of one key can't clash
+        stale = time.time() - _SCRATCH_MAX_AGE
+        entries = []
+        with os.scandir(cache_dir) as it:
+            for e in it:
+                try:
+                    mtime = e.stat().st_mtime
+                    if e.name.endswith(".mp4"):
+                        entries.append((mtime, e.path))
+                    elif e.name.endswith((".use", ".tmp")) and mtime < stale:
+                        os.remove(e.path)
+                except FileNotFoundError:  # released or evicted by another worker meanwhile
+                    pass
+        entries.sort()
+        for _, p in entries[:max(len(entries) - max_files, 0)]:
+            try:
+                os.remove(p)
+            except FileNotFoundError:
+                pass
+    except OSError as e:
+        logging.warning("cache store in %s failed: %s", cache_dir, e)
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+
+def _fetch_clip(url: str):
+    """
+    Returns (path, duration_seconds) for `url` as a local mp4 owned by the caller. Clip-cache
+    hits are hard-linked to a private name so a concurrent sweep can't evict them mid-render;
+    misses are downloaded into a scratch file and published to the cache.
+    """
+    name = hashlib.sha256(url.encode()).hexdigest() + ".mp4"
+    cached = os.path.join(CLIP_CACHE_DIR, name)
+    try:
+        os.utime(cached)  # hit check and LRU touch in one syscall
+        path = _scratch_name(cached, "use")
+        os.link(cached, path)
+    except OSError:
+        path = _download_clip_to_mp4(url)
+        _CLIP_DURATIONS.pop(name, None)  # re-downloaded content may differ
+        _cache_store(path, CLIP_CACHE_DIR, name, CLIP_CACHE_MAX)
+
+    dur = _CLIP_DURATIONS.get(name)
+    if dur is None:
+        try:
+            dur = _clip_duration(path)
+        except Exception:
+            dur = 0.0
+        if dur:
+            if len(_CLIP_DURATIONS) >= 2 * CLIP_CACHE_MAX:
+                _CLIP_DURATIONS.clear()
+            _CLIP_DURATIONS[name] = dur
+    return path, dur
+
+
 def generate_merged_video(video_plan, output_path):
     """
     video_plan = [(media_url, duration_seconds), ...]
-    Downloads each segment to local mp4 (handling HLS/webm) and concatenates with MoviePy.
+    Downloads every distinct clip concurrently to a local mp4 (handling HLS/webm), renders
+    each plan entry to the common segment format at its planned duration, then joins them
+    with ffmpeg's concat demuxer (stream copy, no re-encode of the full video).
+    A plan that was rendered before is served from the render cache instead.
     """
-    from moviepy.editor import VideoFileClip, concatenate_videoclips
+    key = _plan_key(video_plan)
+    if _render_cache_fetch(key, output_path):
+        logging.info("♻️ render cache hit %s → %s", key[:12], output_path)
+        return
 
-    tmp_files, clips = [], []
+    tmp_files, segments = [], []
     try:
+        # Fetch each distinct URL once, all in flight together; order is restored below
+        urls = list(dict.fromkeys(url for url, _ in video_plan))
+        futures = {u: _DOWNLOAD_POOL.submit(_fetch_clip, u) for u in urls}
+        local = {}
+        for u, fut in futures.items():
+            try:
+                local[u] = fut.result()
+                tmp_files.append(local[u][0])
+            except Exception as e:
+                logging.warning("⚠️ skip clip %s: %s", u, e)
+
         for url, dur in video_plan:
+            if url not in local:
+                continue
+            local_mp4, src_dur = local[url]
             try:
-                local_mp4 = _download_clip_to_mp4(url)
-                tmp_files.append(local_mp4)
-                clips.append(VideoFileClip(local_mp4).set_duration(max(float(dur), 0.08)))
+                seg = _tmp_path(".mp4")
+                tmp_files.append(seg)
+                _render_segment(local_mp4, max(float(dur), 0.08), seg, src_dur)
+                segments.append(seg)
             except Exception as e:
                 logging.warning("⚠️ skip clip %s: %s", url, e)
 
-        if not clips:
+        if not segments:
             raise RuntimeError("No ASL clips available to merge.")
 
-        final = concatenate_videoclips(clips, method="compose")
-        final.write_videofile(
-            output_path, codec="libx264", audio=False, fps=24, verbose=False, logger=None
-        )
-        for c in clips:
-            try:
-                c.close()
-            except Exception:
-                pass
+        # The concat list goes in on stdin; entries need the file: scheme or ffmpeg
+        # resolves them relative to pipe:
+        concat_list = "".join(f"file 'file:{p}'\n" for p in segments).encode()
+        cmd = [
+            _ffmpeg_bin(), "-y", "-f", "concat", "-safe", "0",
+            "-protocol_whitelist", "file,pipe", "-i", "pipe:0",
+            "-c", "copy", "-movflags", "+faststart", output_path,
+        ]
+        cp = subprocess.run(cmd, input=concat_list, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        if cp.returncode != 0:
+            raise RuntimeError(f"ffmpeg concat failed: {cp.stderr.decode(errors='ignore')[-400:]}")
 
         if not os.path.exists(output_path) or os.path.getsize(output_path) == 0:
             raise RuntimeError("Video file not written or empty.")
         logging.info("✅ Wrote video %s (%d bytes)", output_path, os.path.getsize(output_path))
+        # Only complete renders are reusable; a plan with skipped clips may succeed next time
+        if len(segments) == len(video_plan):
+            _cache_store(output_path, RENDER_CACHE_DIR, key + ".mp4", RENDER_CACHE_MAX)
     finally:
         for p in tmp_files:
             try:
@@ -201,11 +426,11 @@ def generate_merged_video(video_plan, output_path):
 def process_audio_worker(job_id: str,
                          audio_path: str,
                          video_jobs: dict,
-                         translate_text_to_sign,
+                         translate_words_to_sign,
                          static_dir: str):
     """
     - Transcribe with AssemblyAI
-    - For each word, look up SignASL URLs and allocate durations from AAI timings
+    - Look up SignASL URLs for all words in one concurrent batch and allocate durations from AAI timings
     - Merge to /videos/output_<job_id>.mp4 (served by main.py)
     - Update `video_jobs[job_id]`
     """
@@ -219,7 +444,7 @@ def process_audio_worker(job_id: str,
         logging.info("🗣️ [%s] transcript len=%d, words=%d", job_id, len(transcript), len(words))
 
         # 2) Build plan using word timings
-        plan = []
+        timed = []
         for w in words:
             text = (w.get("text") or "").strip()
             try:
@@ -229,16 +454,18 @@ def process_audio_worker(job_id: str,
                 start, end = 0, 0
             dur_s = max((end - start) / 1000.0, 0.12)  # min duration per token
 
-            if not text:
-                continue
+            if text:
+                timed.append((text, dur_s))
 
-            # get URLs for this word (translate_text_to_sign splits tokens; ok for single token)
-            try:
-                urls = translate_text_to_sign(text) or []
-            except Exception as e:
-                logging.warning("lookup failed for '%s': %s", text, e)
-                urls = []
+        # get URLs for every word at once (lookups overlap instead of serializing)
+        try:
+            per_word = translate_words_to_sign([text for text, _ in timed])
+        except Exception as e:
+            logging.warning("[%s] lookup failed: %s", job_id, e)
+            per_word = [[] for _ in timed]
 
+        plan = []
+        for (_, dur_s), urls in zip(timed, per_word):
             if not urls:
                 continue
 
@@ -252,7 +479,7 @@ def process_audio_worker(job_id: str,
         if not plan:
             # Hard fallback: try the whole sentence once (may find a generic clip)
             try:
-                urls = translate_text_to_sign(transcript) or []
+                urls = [u for hits in translate_words_to_sign(transcript.split()) for u in hits]
             except Exception:
                 urls = []
             for u in urls[:6]: